@@ -6,8 +6,14 @@ Reads the filtered credentials list and inserts them alphabetically
 into the CREDENTIALS array in NameEnhanced.ts.
 """
 
+import os
 import re
-from typing import List, Tuple
+import shutil
+import tempfile
+from typing import List, Set, Tuple
+
+# Matches a quoted credential entry on its own line
+CREDENTIAL_LINE = re.compile(r'^[^\S\n]*"([^"\n]+)",?[^\S\n]*$', re.MULTILINE)
 
 def load_credentials_to_add(filepath: str) -> List[str]:
     """Load credentials from filtered list file"""
@@ -20,50 +26,52 @@ def load_credentials_to_add(filepath: str) -> List[str]:
                 creds.append(line)
     return creds
 
-def load_existing_credentials(filepath: str) -> Tuple[List[str], str]:
-    """Load existing credentials and file content"""
+def normalize(s: str) -> str:
+    """Normalize for comparison (case-insensitive, remove periods)"""
+    return s.replace('.', '').upper()
+
+def load_existing_credentials(filepath: str) -> Tuple[List[str], Set[str], str]:
+    """Load existing credentials (deduplicated), their normalized forms and file content"""
     with open(filepath, 'r') as f:
         content = f.read()
     
-    # Extract existing credentials
-    existing = []
-    pattern = r'^\s*"([^"]+)",?\s*$'
-    for line in content.split('\n'):
-        match = re.match(pattern, line)
-        if match:
-            existing.append(match.group(1))
+    # Extract existing credentials in a single scan of the file, dropping
+    # exact duplicates. Variants like "M.S." and "MS" are both kept.
+    existing = list(dict.fromkeys(CREDENTIAL_LINE.findall(content)))
+    existing_normalized = {normalize(c) for c in existing}
     
-    return existing, content
+    return existing, existing_normalized, content
 
-def insert_credentials_alphabetically(existing: List[str], to_add: List[str]) -> List[str]:
+def insert_credentials_alphabetically(existing: List[str], existing_normalized: Set[str], to_add: List[str]) -> List[str]:
     """Merge and sort credentials alphabetically"""
-    # Normalize for comparison (case-insensitive, remove periods)
-    def normalize(s):
-        return s.replace('.', '').upper()
+    # Normalize once per credential
+    normalized = {c: normalize(c) for c in existing + to_add}
     
     # Filter out credentials that already exist
-    existing_normalized = {normalize(c) for c in existing}
-    new_creds = [c for c in to_add if normalize(c) not in existing_normalized]
+    new_creds = [c for c in to_add if normalized[c] not in existing_normalized]
     
-    # Merge and sort
-    all_creds = existing + new_creds
-    all_creds.sort(key=lambda x: (normalize(x), x))
+    # Merge and sort (decorate-sort-undecorate with the cached keys)
+    decorated = [(normalized[c], c) for c in existing + new_creds]
+    decorated.sort()
+    all_creds = [c for _, c in decorated]
     
     return all_creds, new_creds
 
 def update_credentials_file(filepath: str, new_credentials: List[str]):
     """Update NameEnhanced.ts with new credentials"""
-    with open(filepath, 'r') as f:
+    with open(filepath, 'r', encoding='utf-8') as f:
         lines = f.readlines()
     
     # Find the CREDENTIALS array
     start_idx = None
     end_idx = None
     
+    # Single pass: look for the opening line, then only for the closing line
     for i, line in enumerate(lines):
-        if 'export const ALL_CREDENTIALS = [' in line:
-            start_idx = i + 1
-        elif start_idx is not None and '] as const;' in line:
+        if start_idx is None:
+            if 'export const ALL_CREDENTIALS = [' in line:
+                start_idx = i + 1
+        elif '] as const;' in line:
             end_idx = i
             break
     
@@ -71,17 +79,24 @@ def update_credentials_file(filepath: str, new_credentials: List[str]):
         print("❌ Could not find CREDENTIALS array in file")
         return False
     
-    # Generate new credentials lines
-    new_lines = []
-    for cred in new_credentials:
-        new_lines.append(f'  "{cred}",\n')
-    
-    # Replace old credentials with new
-    lines[start_idx:end_idx] = new_lines
-    
-    # Write back
-    with open(filepath, 'w') as f:
-        f.writelines(lines)
+    # Build the new content around the replaced credentials block
+    content = (
+        ''.join(lines[:start_idx])
+        + ''.join(f'  "{cred}",\n' for cred in new_credentials)
+        + ''.join(lines[end_idx:])
+    ).encode('utf-8')
+    
+    # Write to a temp file in a single call, then atomically swap it in so
+    # a failed write never leaves a truncated file behind
+    tmp = tempfile.NamedTemporaryFile(dir=os.path.dirname(filepath) or '.', delete=False)
+    try:
+        with tmp:
+            tmp.write(content)
+        shutil.copymode(filepath, tmp.name)
+        os.replace(tmp.name, filepath)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
     
     return True
 
@@ -102,13 +117,13 @@ def main():
     
     # Load existing credentials
     print("Loading existing credentials from NameEnhanced.ts...")
-    existing, content = load_existing_credentials(name_enhanced_file)
+    existing, existing_normalized, content = load_existing_credentials(name_enhanced_file)
     print(f"✅ Found {len(existing)} existing credentials")
     print()
     
     # Merge and sort
     print("Merging and sorting credentials...")
-    all_creds, new_creds = insert_credentials_alphabetically(existing, to_add)
+    all_creds, new_creds = insert_credentials_alphabetically(existing, existing_normalized, to_add)
     print(f"✅ Total credentials after merge: {len(all_creds)}")
     print(f"✅ New credentials added: {len(new_creds)}")
     print()
@@ -9,6 +9,22 @@ import re
 from collections import Counter
 from pathlib import Path
 
+CSV_BUFFER_SIZE = 1024 * 1024
+
+# Credential patterns, compiled once rather than on every row.
+# Degree/license and retirement suffixes share one alternation: both only
+# match the final word, so at most one of them can ever apply.
+CREDENTIAL_SUFFIX = re.compile(
+    r'.*\b(Jr|Sr|II|III|IV|V|PhD|MD|MBA|MS|MA|BS|BA|DDS|DVM|EdD|JD|LLM|CPA|PE|RN|LPN|LCSW|PMP|CSM|CISSP|CISM'
+    r'|Esq|Ret|Retired)\.?$',
+    re.IGNORECASE
+)
+TRAILING_WORD = re.compile(r'\b([A-Za-z\-\.]+)\.?$')
+
+def is_allcaps_credential(s):
+    """Equivalent to re.fullmatch(r'[A-Z]{2,5}', s) without entering the regex engine."""
+    return 2 <= len(s) <= 5 and s.isascii() and s.isalpha() and s.isupper()
+
 def extract_potential_credentials(name_str, last_name_str):
     """
     Extract potential credentials that appear in last_name but shouldn't be there.
@@ -26,7 +42,7 @@ def extract_potential_credentials(name_str, last_name_str):
     potential_creds = []
     
     # Pattern 1: All caps 2-5 letters at end of last name
-    if re.match(r'^[A-Z]{2,5}$', last_name_str):
+    if is_allcaps_credential(last_name_str):
         potential_creds.append(last_name_str)
     
     # Pattern 2: Mixed case with periods
@@ -38,17 +54,11 @@ def extract_potential_credentials(name_str, last_name_str):
         potential_creds.append(last_name_str)
     
     # Pattern 4: Ends with common credential suffixes
-    credential_patterns = [
-        r'.*\b(Jr|Sr|II|III|IV|V|PhD|MD|MBA|MS|MA|BS|BA|DDS|DVM|EdD|JD|LLM|CPA|PE|RN|LPN|LCSW|PMP|CSM|CISSP|CISM)\.?$',
-        r'.*\b(Esq|Ret|Retired)\.?$'
-    ]
-    
-    for pattern in credential_patterns:
-        if re.match(pattern, last_name_str, re.IGNORECASE):
-            # Extract the credential part
-            match = re.search(r'\b([A-Za-z\-\.]+)\.?$', last_name_str)
-            if match:
-                potential_creds.append(match.group(1))
+    if CREDENTIAL_SUFFIX.match(last_name_str):
+        # Extract the credential part
+        match = TRAILING_WORD.search(last_name_str)
+        if match:
+            potential_creds.append(match.group(1))
     
     return potential_creds
 
@@ -57,65 +67,68 @@ def analyze_output(input_csv, output_csv):
     Compare input Name vs output Last Name for all rows.
     Generate comprehensive failure report.
     """
-    print("Loading input CSV...")
-    input_rows = []
-    with open(input_csv, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            input_rows.append(row)
-    
-    print(f"Loaded {len(input_rows)} input rows")
-    
-    print("Loading output CSV...")
-    output_rows = []
-    with open(output_csv, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            output_rows.append(row)
-    
-    print(f"Loaded {len(output_rows)} output rows")
-    
-    # Compare rows
+    # Compare rows, streaming both files so only one row pair is held at a time
     failures = []
-    all_potential_creds = []
+    cred_counts = Counter()
+    total_rows = 0
     
     print("Analyzing rows...")
-    for i, (input_row, output_row) in enumerate(zip(input_rows, output_rows), start=2):  # Start at 2 (row 1 is header)
-        input_name = input_row.get('Name', '').strip()
-        output_last_name = output_row.get('Last Name', '').strip()
-        output_first_name = output_row.get('First Name', '').strip()
+    with open(input_csv, 'r', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as input_file, \
+         open(output_csv, 'r', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as output_file:
+        input_reader = csv.reader(input_file)
+        output_reader = csv.reader(output_file)
         
-        # Skip if no data
-        if not input_name or not output_last_name:
-            continue
+        # Resolve column positions once from the headers
+        name_idx = next(input_reader).index('Name')
+        output_header = next(output_reader)
+        first_idx = output_header.index('First Name')
+        last_idx = output_header.index('Last Name')
         
-        # Check if last name looks like a credential
-        potential_creds = extract_potential_credentials(input_name, output_last_name)
+        # Skip blank lines (csv.reader yields them as empty rows)
+        input_rows = (row for row in input_reader if row)
+        output_rows = (row for row in output_reader if row)
         
-        if potential_creds:
-            failures.append({
-                'row': i,
-                'input_name': input_name,
-                'output_first_name': output_first_name,
-                'output_last_name': output_last_name,
-                'potential_credentials': potential_creds
-            })
-            all_potential_creds.extend(potential_creds)
+        for i, (input_row, output_row) in enumerate(zip(input_rows, output_rows), start=2):  # Start at 2 (row 1 is header)
+            total_rows += 1
+            # Ragged rows may stop short of a column; treat it as empty
+            input_name = input_row[name_idx].strip() if name_idx < len(input_row) else ''
+            output_last_name = output_row[last_idx].strip() if last_idx < len(output_row) else ''
+            output_first_name = output_row[first_idx].strip() if first_idx < len(output_row) else ''
+            
+            # Skip if no data
+            if not input_name or not output_last_name:
+                continue
+            
+            # Check if last name looks like a credential
+            potential_creds = extract_potential_credentials(input_name, output_last_name)
+            
+            if potential_creds:
+                failures.append({
+                    'row': i,
+                    'input_name': input_name,
+                    'output_first_name': output_first_name,
+                    'output_last_name': output_last_name,
+                    'potential_credentials': potential_creds
+                })
+                cred_counts.update(potential_creds)
     
     # Generate report
     print(f"\n{'='*80}")
     print(f"CREDENTIAL STRIPPING FAILURE REPORT")
     print(f"{'='*80}")
-    print(f"\nTotal rows analyzed: {len(input_rows)}")
+    print(f"\nTotal rows analyzed: {total_rows}")
     print(f"Failures found: {len(failures)}")
-    print(f"Failure rate: {len(failures)/len(input_rows)*100:.2f}%")
+    print(f"Failure rate: {len(failures)/total_rows*100:.2f}%")
+    
+    # Rank credentials once; the full ranking goes to the report file and
+    # its head is the top 50, so no separate top-k pass is needed
+    ranked_creds = cred_counts.most_common()
     
     # Top 50 most common missing credentials
-    cred_counts = Counter(all_potential_creds)
     print(f"\n{'='*80}")
     print(f"TOP 50 MOST COMMON MISSING CREDENTIALS")
     print(f"{'='*80}")
-    for cred, count in cred_counts.most_common(50):
+    for cred, count in ranked_creds[:50]:
         print(f"{cred:30s} - {count:4d} occurrences")
     
     # Sample failures (first 20)
@@ -133,14 +146,14 @@ def analyze_output(input_csv, output_csv):
     with open(report_file, 'w', encoding='utf-8') as f:
         f.write(f"COMPREHENSIVE CREDENTIAL STRIPPING FAILURE REPORT\n")
         f.write(f"{'='*80}\n\n")
-        f.write(f"Total rows analyzed: {len(input_rows)}\n")
+        f.write(f"Total rows analyzed: {total_rows}\n")
         f.write(f"Failures found: {len(failures)}\n")
-        f.write(f"Failure rate: {len(failures)/len(input_rows)*100:.2f}%\n\n")
+        f.write(f"Failure rate: {len(failures)/total_rows*100:.2f}%\n\n")
         
         f.write(f"{'='*80}\n")
         f.write(f"ALL MISSING CREDENTIALS (sorted by frequency)\n")
         f.write(f"{'='*80}\n")
-        for cred, count in cred_counts.most_common():
+        for cred, count in ranked_creds:
             f.write(f"{cred:30s} - {count:4d} occurrences\n")
         
         f.write(f"\n{'='*80}\n")
@@ -157,7 +170,7 @@ def analyze_output(input_csv, output_csv):
     print(f"{'='*80}")
     
     # Return unique credentials for further processing
-    return sorted(set(all_potential_creds))
+    return sorted(cred_counts)
 
 if __name__ == '__main__':
     input_csv = '/home/ubuntu/upload/highintentwomenfounderssalessp.csv'
@@ -15,6 +15,12 @@ import sys
 from collections import Counter
 from typing import Set, List, Tuple
 
+CSV_BUFFER_SIZE = 1024 * 1024
+
+# Patterns compiled once rather than on every row
+CREDENTIAL_LINE = re.compile(r'^[^\S\n]*"([^"\n]+)",?[^\S\n]*$', re.MULTILINE)
+HYPHENATED_CREDENTIAL = re.compile(r'^[A-Z]+-[A-Z]+$')
+
 def load_existing_credentials(credentials_file: str) -> Set[str]:
     """Load existing credentials from NameEnhanced.ts"""
     credentials = set()
@@ -23,17 +29,17 @@ def load_existing_credentials(credentials_file: str) -> Set[str]:
         content = f.read()
         
     # Extract credentials from the array (lines with quoted strings)
-    pattern = r'^\s*"([^"]+)",?\s*$'
-    for line in content.split('\n'):
-        match = re.match(pattern, line)
-        if match:
-            credential = match.group(1)
-            # Normalize: remove periods for comparison
-            normalized = credential.replace('.', '').upper()
-            credentials.add(normalized)
+    for credential in CREDENTIAL_LINE.findall(content):
+        # Normalize: remove periods for comparison
+        normalized = credential.replace('.', '').upper()
+        credentials.add(normalized)
     
     return credentials
 
+def is_allcaps_credential(s: str) -> bool:
+    """Equivalent to re.fullmatch(r'[A-Z]{2,10}', s) without entering the regex engine."""
+    return 2 <= len(s) <= 10 and s.isascii() and s.isalpha() and s.isupper()
+
 def extract_potential_credentials(name: str, last_name: str) -> List[str]:
     """
     Extract potential credentials from name that ended up in last_name.
@@ -46,11 +52,11 @@ def extract_potential_credentials(name: str, last_name: str) -> List[str]:
     potential_creds = []
     
     # Pattern 1: Last name looks like a credential (all caps, 2-10 chars, no spaces)
-    if last_name and re.match(r'^[A-Z]{2,10}$', last_name):
+    if last_name and is_allcaps_credential(last_name):
         potential_creds.append(last_name)
     
     # Pattern 2: Last name has hyphen (like PMI-ACP)
-    if last_name and '-' in last_name and re.match(r'^[A-Z]+-[A-Z]+$', last_name):
+    if last_name and '-' in last_name and HYPHENATED_CREDENTIAL.match(last_name):
         potential_creds.append(last_name)
     
     # Pattern 3: Extract everything after comma in original name
@@ -61,9 +67,9 @@ def extract_potential_credentials(name: str, last_name: str) -> List[str]:
         for part in parts:
             # Remove periods and check if it looks like a credential
             normalized = part.replace('.', '').replace(' ', '')
-            if re.match(r'^[A-Z]{2,10}$', normalized):
+            if is_allcaps_credential(normalized):
                 potential_creds.append(normalized)
-            elif '-' in normalized and re.match(r'^[A-Z]+-[A-Z]+$', normalized):
+            elif '-' in normalized and HYPHENATED_CREDENTIAL.match(normalized):
                 potential_creds.append(normalized)
     
     # Pattern 4: Extract words at end of name (before comma if exists)
@@ -72,7 +78,7 @@ def extract_potential_credentials(name: str, last_name: str) -> List[str]:
     if len(words) >= 2:
         last_word = words[-1]
         # Check if last word is all caps (likely credential)
-        if re.match(r'^[A-Z]{2,10}$', last_word):
+        if is_allcaps_credential(last_word):
             potential_creds.append(last_word)
     
     return potential_creds
@@ -87,42 +93,46 @@ def analyze_csvs(input_csv: str, output_csv: str, existing_creds: Set[str]) -> T
     missing_creds = Counter()
     examples = []
     
-    # Read input CSV
-    with open(input_csv, 'r', encoding='utf-8') as f:
-        input_reader = csv.DictReader(f)
-        input_rows = list(input_reader)
-    
-    # Read output CSV
-    with open(output_csv, 'r', encoding='utf-8') as f:
-        output_reader = csv.DictReader(f)
-        output_rows = list(output_reader)
-    
-    # Compare row by row
-    for i, (input_row, output_row) in enumerate(zip(input_rows, output_rows), start=2):
-        input_name = input_row.get('Name', '')
-        output_last = output_row.get('Last Name', '')
+    # Stream both CSVs and compare row by row
+    with open(input_csv, 'r', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as input_file, \
+         open(output_csv, 'r', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as output_file:
+        input_reader = csv.reader(input_file)
+        output_reader = csv.reader(output_file)
         
-        if not input_name or not output_last:
-            continue
+        # Resolve column positions once from the headers
+        name_idx = next(input_reader).index('Name')
+        last_idx = next(output_reader).index('Last Name')
         
-        # Extract potential credentials
-        potential = extract_potential_credentials(input_name, output_last)
+        # Skip blank lines (csv.reader yields them as empty rows)
+        input_rows = (row for row in input_reader if row)
+        output_rows = (row for row in output_reader if row)
         
-        for cred in potential:
-            normalized = cred.replace('.', '').upper()
+        for i, (input_row, output_row) in enumerate(zip(input_rows, output_rows), start=2):
+            # Ragged rows may stop short of a column; treat it as empty
+            input_name = input_row[name_idx] if name_idx < len(input_row) else ''
+            output_last = output_row[last_idx] if last_idx < len(output_row) else ''
+            
+            if not input_name or not output_last:
+                continue
+            
+            # Extract potential credentials
+            potential = extract_potential_credentials(input_name, output_last)
             
-            # Check if this credential is NOT in existing list
-            if normalized not in existing_creds:
-                missing_creds[normalized] += 1
+            for cred in potential:
+                normalized = cred.replace('.', '').upper()
                 
-                # Save example (first 5 occurrences)
-                if missing_creds[normalized] <= 5:
-                    examples.append({
-                        'row': i,
-                        'credential': normalized,
-                        'input_name': input_name,
-                        'output_last': output_last
-                    })
+                # Check if this credential is NOT in existing list
+                if normalized not in existing_creds:
+                    missing_creds[normalized] += 1
+                    
+                    # Save example (first 5 occurrences)
+                    if missing_creds[normalized] <= 5:
+                        examples.append({
+                            'row': i,
+                            'credential': normalized,
+                            'input_name': input_name,
+                            'output_last': output_last
+                        })
     
     return missing_creds, examples
 
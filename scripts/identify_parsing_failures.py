@@ -11,9 +11,13 @@ Check for:
 
 import csv
 import re
+import shutil
+import tempfile
 from collections import Counter
 from pathlib import Path
 
+CSV_BUFFER_SIZE = 1024 * 1024
+
 # Common job title keywords
 JOB_KEYWORDS = [
     'CEO', 'CFO', 'COO', 'CTO', 'President', 'VP', 'Vice President',
@@ -24,22 +28,31 @@ JOB_KEYWORDS = [
     'Engineer', 'Architect', 'Strategist', 'Advisor', 'Expert'
 ]
 
+# Keywords are matched by set lookup against the words in the text. A
+# multi-word keyword ('Vice President') needs no check of its own as long as
+# one of its words is also a single-word keyword.
+WORD_PATTERN = re.compile(r'\w+')
+JOB_KEYWORD_WORDS = frozenset(k.lower() for k in JOB_KEYWORDS if ' ' not in k)
+assert all(
+    not JOB_KEYWORD_WORDS.isdisjoint(k.lower().split())
+    for k in JOB_KEYWORDS if ' ' in k
+), 'multi-word job keyword needs a single-word keyword among its words'
+
+# Common emoji/symbols (includes the U+FE0F variation selector that follows
+# some of them, and '?' left behind by lossy encodings)
+EMOJI_CHARS = frozenset('•✊?❤️⭐️🌟💪👍🎯🚀💡🔥⚡️✨🌈🎉🎊🏆🥇')
+
 def has_job_title(text):
     """Check if text contains job title keywords."""
     if not text:
         return False
-    for keyword in JOB_KEYWORDS:
-        if re.search(rf'\b{keyword}\b', text, re.IGNORECASE):
-            return True
-    return False
+    return not JOB_KEYWORD_WORDS.isdisjoint(WORD_PATTERN.findall(text.lower()))
 
 def has_emoji(text):
     """Check if text contains emojis or special symbols."""
     if not text:
         return False
-    # Common emoji/symbol patterns
-    emoji_pattern = r'[•✊?❤️⭐️🌟💪👍🎯🚀💡🔥⚡️✨🌈🎉🎊🏆🥇]'
-    return bool(re.search(emoji_pattern, text))
+    return not EMOJI_CHARS.isdisjoint(text)
 
 def has_trailing_hyphen(text):
     """Check if text ends with hyphen."""
@@ -60,125 +73,159 @@ def has_multiple_words_in_last_name(last_name):
         return True
     return False
 
-def analyze_failures(output_csv):
+def classify_row(row):
     """
-    Analyze output CSV for ALL parsing failures.
+    Check one (row number, first name, last name) tuple for parsing failures.
+    Returns failure dict, or None if the row looks fine.
     """
-    print("Loading output CSV...")
-    output_rows = []
-    with open(output_csv, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            output_rows.append(row)
+    i, first_name, last_name = row
+    first_name = first_name.strip()
+    last_name = last_name.strip()
+    
+    failure_reasons = []
+    
+    # Check for empty names
+    if not first_name and not last_name:
+        failure_reasons.append('empty_names')
+    elif not first_name:
+        failure_reasons.append('empty_first_name')
+    elif not last_name:
+        failure_reasons.append('empty_last_name')
+    
+    # Check for job titles
+    if has_job_title(first_name):
+        failure_reasons.append('job_title_in_first_name')
+    if has_job_title(last_name):
+        failure_reasons.append('job_title_in_last_name')
     
-    print(f"Loaded {len(output_rows)} output rows")
+    # Check for emojis
+    if has_emoji(first_name):
+        failure_reasons.append('emoji_in_first_name')
+    if has_emoji(last_name):
+        failure_reasons.append('emoji_in_last_name')
+    
+    # Check for trailing hyphens
+    if has_trailing_hyphen(first_name):
+        failure_reasons.append('trailing_hyphen_in_first_name')
+    if has_trailing_hyphen(last_name):
+        failure_reasons.append('trailing_hyphen_in_last_name')
+    
+    # Check for multiple words in last name
+    if has_multiple_words_in_last_name(last_name):
+        failure_reasons.append('multiple_words_in_last_name')
+    
+    if not failure_reasons:
+        return None
+    
+    return {
+        'row': i,
+        'first_name': first_name,
+        'last_name': last_name,
+        'reasons': failure_reasons
+    }
+
+def format_failure(failure):
+    """Format one failure record for the report."""
+    return (
+        f"\nRow {failure['row']}:\n"
+        f"  First Name: {failure['first_name']}\n"
+        f"  Last Name: {failure['last_name']}\n"
+        f"  Reasons: {', '.join(failure['reasons'])}\n"
+    )
+
+def analyze_failures(output_csv):
+    """
+    Analyze output CSV for ALL parsing failures.
     
-    failures = []
+    Failure records are streamed to a spool file as they are found, so
+    memory stays flat regardless of input size. Returns Counter of
+    failure types.
+    """
+    total_rows = 0
+    failure_count = 0
     failure_types = Counter()
+    samples = []
     
     print("Analyzing rows...")
-    for i, row in enumerate(output_rows, start=2):  # Start at 2 (row 1 is header)
-        first_name = row.get('First Name', '').strip()
-        last_name = row.get('Last Name', '').strip()
-        
-        failure_reasons = []
-        
-        # Check for empty names
-        if not first_name and not last_name:
-            failure_reasons.append('empty_names')
-        elif not first_name:
-            failure_reasons.append('empty_first_name')
-        elif not last_name:
-            failure_reasons.append('empty_last_name')
-        
-        # Check for job titles
-        if has_job_title(first_name):
-            failure_reasons.append('job_title_in_first_name')
-        if has_job_title(last_name):
-            failure_reasons.append('job_title_in_last_name')
+    with open(output_csv, 'r', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f, \
+         tempfile.TemporaryFile('w+', encoding='utf-8') as spool:
+        reader = csv.reader(f)
+        header = next(reader)
+        # Keep only the two name columns, resolved once from the header
+        first_idx = header.index('First Name')
+        last_idx = header.index('Last Name')
         
-        # Check for emojis
-        if has_emoji(first_name):
-            failure_reasons.append('emoji_in_first_name')
-        if has_emoji(last_name):
-            failure_reasons.append('emoji_in_last_name')
+        output_rows = (row for row in reader if row)  # csv.reader yields blank lines as empty rows
+        # Ragged rows may stop short of a column; treat it as empty
+        rows = (
+            (
+                i,
+                row[first_idx] if first_idx < len(row) else '',
+                row[last_idx] if last_idx < len(row) else ''
+            )
+            for i, row in enumerate(output_rows, start=2)  # Start at 2 (row 1 is header)
+        )
         
-        # Check for trailing hyphens
-        if has_trailing_hyphen(first_name):
-            failure_reasons.append('trailing_hyphen_in_first_name')
-        if has_trailing_hyphen(last_name):
-            failure_reasons.append('trailing_hyphen_in_last_name')
+        for failure in map(classify_row, rows):
+            total_rows += 1
+            if failure:
+                failure_count += 1
+                for reason in failure['reasons']:
+                    failure_types[reason] += 1
+                if len(samples) < 30:
+                    samples.append(failure)
+                spool.write(format_failure(failure))
         
-        # Check for multiple words in last name
-        if has_multiple_words_in_last_name(last_name):
-            failure_reasons.append('multiple_words_in_last_name')
+        # Generate report
+        print(f"\n{'='*80}")
+        print(f"NAME PARSING FAILURE REPORT")
+        print(f"{'='*80}")
+        print(f"\nTotal rows analyzed: {total_rows}")
+        print(f"Failures found: {failure_count}")
+        print(f"Failure rate: {failure_count/total_rows*100:.2f}%")
         
-        if failure_reasons:
-            failures.append({
-                'row': i,
-                'first_name': first_name,
-                'last_name': last_name,
-                'reasons': failure_reasons
-            })
-            for reason in failure_reasons:
-                failure_types[reason] += 1
-    
-    # Generate report
-    print(f"\n{'='*80}")
-    print(f"NAME PARSING FAILURE REPORT")
-    print(f"{'='*80}")
-    print(f"\nTotal rows analyzed: {len(output_rows)}")
-    print(f"Failures found: {len(failures)}")
-    print(f"Failure rate: {len(failures)/len(output_rows)*100:.2f}%")
-    
-    # Failure types breakdown
-    print(f"\n{'='*80}")
-    print(f"FAILURE TYPES BREAKDOWN")
-    print(f"{'='*80}")
-    for failure_type, count in failure_types.most_common():
-        print(f"{failure_type:40s} - {count:4d} occurrences")
-    
-    # Sample failures (first 30)
-    print(f"\n{'='*80}")
-    print(f"SAMPLE FAILURES (First 30)")
-    print(f"{'='*80}")
-    for failure in failures[:30]:
-        print(f"\nRow {failure['row']}:")
-        print(f"  First Name: {failure['first_name']}")
-        print(f"  Last Name: {failure['last_name']}")
-        print(f"  Reasons: {', '.join(failure['reasons'])}")
-    
-    # Save full report to file
-    report_file = Path(__file__).parent / 'parsing_failures_report.txt'
-    with open(report_file, 'w', encoding='utf-8') as f:
-        f.write(f"NAME PARSING FAILURE REPORT\n")
-        f.write(f"{'='*80}\n\n")
-        f.write(f"Total rows analyzed: {len(output_rows)}\n")
-        f.write(f"Failures found: {len(failures)}\n")
-        f.write(f"Failure rate: {len(failures)/len(output_rows)*100:.2f}%\n\n")
-        
-        f.write(f"{'='*80}\n")
-        f.write(f"FAILURE TYPES BREAKDOWN\n")
-        f.write(f"{'='*80}\n")
+        # Failure types breakdown
+        print(f"\n{'='*80}")
+        print(f"FAILURE TYPES BREAKDOWN")
+        print(f"{'='*80}")
         for failure_type, count in failure_types.most_common():
-            f.write(f"{failure_type:40s} - {count:4d} occurrences\n")
+            print(f"{failure_type:40s} - {count:4d} occurrences")
+        
+        # Sample failures (first 30)
+        print(f"\n{'='*80}")
+        print(f"SAMPLE FAILURES (First 30)")
+        print(f"{'='*80}")
+        for failure in samples:
+            print(format_failure(failure), end='')
         
-        f.write(f"\n{'='*80}\n")
-        f.write(f"ALL FAILURES (complete list)\n")
-        f.write(f"{'='*80}\n")
-        for failure in failures:
-            f.write(f"\nRow {failure['row']}:\n")
-            f.write(f"  First Name: {failure['first_name']}\n")
-            f.write(f"  Last Name: {failure['last_name']}\n")
-            f.write(f"  Reasons: {', '.join(failure['reasons'])}\n")
+        # Save full report to file, copying the spooled failure records after the summary
+        report_file = Path(__file__).parent / 'parsing_failures_report.txt'
+        with open(report_file, 'w', encoding='utf-8') as report:
+            report.write(f"NAME PARSING FAILURE REPORT\n")
+            report.write(f"{'='*80}\n\n")
+            report.write(f"Total rows analyzed: {total_rows}\n")
+            report.write(f"Failures found: {failure_count}\n")
+            report.write(f"Failure rate: {failure_count/total_rows*100:.2f}%\n\n")
+            
+            report.write(f"{'='*80}\n")
+            report.write(f"FAILURE TYPES BREAKDOWN\n")
+            report.write(f"{'='*80}\n")
+            for failure_type, count in failure_types.most_common():
+                report.write(f"{failure_type:40s} - {count:4d} occurrences\n")
+            
+            report.write(f"\n{'='*80}\n")
+            report.write(f"ALL FAILURES (complete list)\n")
+            report.write(f"{'='*80}\n")
+            spool.seek(0)
+            shutil.copyfileobj(spool, report)
     
     print(f"\n{'='*80}")
     print(f"Full report saved to: {report_file}")
     print(f"{'='*80}")
     
-    return failures
+    return failure_types
 
 if __name__ == '__main__':
     output_csv = '/home/ubuntu/upload/normalized_highintentwomenfounderssalessp(4).csv'
     
-    failures = analyze_failures(output_csv)
+    failure_types = analyze_failures(output_csv)